@@ -1,5 +1,11 @@
 import os
+import io
+import csv
+import time
+import queue
 import logging
+import threading
+from contextlib import contextmanager
 import sqlite3
 from datetime import datetime
 import telebot
@@ -10,25 +16,207 @@ from database import DatabaseManager
 
 logger = logging.getLogger(__name__)
 
+# Seconds admin-panel DB reads are reused before hitting SQLite again
+CACHE_TTL = 30
+
+# Worker threads telebot uses to run handlers concurrently
+BOT_WORKER_THREADS = 8
+
+# Max chat workers running callbacks at once
+MAX_CHAT_WORKERS = 32
+
+# Seconds an idle chat worker waits for work before exiting
+CHAT_WORKER_IDLE = 60
+
+# Seconds to wait for more clicks before sending a debounced edit
+EDIT_DEBOUNCE = 0.5
+
+# Broadcast sends per second, kept under Telegram's ~30 msg/s bot limit
+BROADCAST_RATE = 25
+
+# Threads sending broadcast messages in parallel
+BROADCAST_WORKERS = 8
+
+# Callbacks that answer the query themselves with a status text
+SELF_ACKING_CALLBACKS = frozenset({
+    'toggle_status', 'toggle_maintenance', 'export_users', 'remove_channel'
+})
+
 class AdminPanel:
-    def __init__(self, bot_token=None, admin_ids=None):
+    def __init__(self, bot_token=None, admin_ids=None, bot=None, db=None):
         # Get from environment variables if not provided
         self.bot_token = bot_token or os.getenv('BOT_TOKEN')
-        self.admin_ids = admin_ids or os.getenv('ADMIN_IDS', '').split(',')
+        admin_ids = admin_ids or os.getenv('ADMIN_IDS', '').split(',')
+        self.admin_ids = frozenset(str(x).strip() for x in admin_ids if str(x).strip())
+        self._admin_id_ints = frozenset(int(x) for x in self.admin_ids if x.lstrip('-').isdigit())
         
-        if not self.bot_token:
+        if bot is None and not self.bot_token:
             raise ValueError("Bot token not found in environment variables")
         
-        self.bot = telebot.TeleBot(self.bot_token)
-        self.db = DatabaseManager()
+        # Reuse the main bot/database when given, so there is one polling loop
+        self.bot = bot or telebot.TeleBot(self.bot_token, threaded=True, num_threads=BOT_WORKER_THREADS)
+        self.db = db or DatabaseManager()
+        self._cache = {}
+        self._chat_queues = {}
+        self._chat_queues_lock = threading.Lock()
+        self._chat_slots = threading.Semaphore(MAX_CHAT_WORKERS)
+        self._pending_edits = {}
+        self._next_send_at = 0.0
+        self._send_slot_lock = threading.Lock()
+        self._edits_lock = threading.Lock()
+        self._send_locks = {}
+        
+        # Static menus are built once and reused for every send/edit
+        self.build_static_menus()
         
         # Setup admin handlers
         self.setup_admin_handlers()
     
     def is_admin(self, user_id):
         """Check if user is admin"""
+        if isinstance(user_id, int):
+            return user_id in self._admin_id_ints
         return str(user_id) in self.admin_ids
     
+    def build_static_menus(self):
+        """Build keyboards and texts that never change"""
+        self._back_btn = InlineKeyboardButton("⬅️ Back", callback_data="back_to_admin")
+        
+        self._main_menu_text = (
+            "🛠️ <b>Admin Panel</b>\n\n"
+            "Choose an option to manage your bot:"
+        )
+        self._main_menu_kb = InlineKeyboardMarkup()
+        self._main_menu_kb.row(
+            InlineKeyboardButton("📊 Statistics", callback_data="admin_stats"),
+            InlineKeyboardButton("👥 Users", callback_data="admin_users")
+        )
+        self._main_menu_kb.row(
+            InlineKeyboardButton("📢 Broadcast", callback_data="admin_broadcast"),
+            InlineKeyboardButton("⚙️ Settings", callback_data="admin_settings")
+        )
+        self._main_menu_kb.row(
+            InlineKeyboardButton("🔗 Force Subscribe", callback_data="admin_force_sub"),
+            InlineKeyboardButton("📥 Downloads", callback_data="admin_downloads")
+        )
+        
+        self._broadcast_kb = InlineKeyboardMarkup()
+        self._broadcast_kb.add(InlineKeyboardButton("📢 Send Broadcast", callback_data="send_broadcast"))
+        self._broadcast_kb.add(self._back_btn)
+        
+        self._stats_kb = InlineKeyboardMarkup()
+        self._stats_kb.add(InlineKeyboardButton("🔄 Refresh", callback_data="admin_stats"))
+        self._stats_kb.add(self._back_btn)
+        
+        self._users_kb = InlineKeyboardMarkup()
+        self._users_kb.row(
+            InlineKeyboardButton("📜 All Users", callback_data="all_users"),
+            InlineKeyboardButton("📧 Export Users", callback_data="export_users")
+        )
+        self._users_kb.add(self._back_btn)
+        
+        self._all_users_kb = InlineKeyboardMarkup()
+        self._all_users_kb.add(InlineKeyboardButton("⬅️ Back", callback_data="admin_users"))
+        
+        self._force_sub_kb = InlineKeyboardMarkup()
+        self._force_sub_kb.row(
+            InlineKeyboardButton("➕ Add Channel", callback_data="add_channel"),
+            InlineKeyboardButton("➖ Remove Channel", callback_data="remove_channel")
+        )
+        self._force_sub_kb.add(self._back_btn)
+        
+        self._downloads_kb = InlineKeyboardMarkup()
+        self._downloads_kb.add(InlineKeyboardButton("🔄 Refresh", callback_data="admin_downloads"))
+        self._downloads_kb.add(self._back_btn)
+        
+        # Serialize once; telebot sends a str reply_markup as-is instead of
+        # converting the markup objects to JSON on every call
+        for name in ('_main_menu_kb', '_broadcast_kb', '_stats_kb', '_users_kb',
+                     '_all_users_kb', '_force_sub_kb', '_downloads_kb'):
+            setattr(self, name, getattr(self, name).to_json())
+    
+    def _cached(self, key, fn, ttl=CACHE_TTL):
+        """Return a cached DB read, recomputing it once the TTL expires"""
+        now = time.monotonic()
+        hit = self._cache.get(key)
+        if hit and now - hit[0] < ttl:
+            return hit[1]
+        value = fn()
+        self._cache[key] = (now, value)
+        return value
+    
+    def invalidate_cache(self):
+        """Drop cached reads after a settings or channel change"""
+        self._cache.clear()
+    
+    def _schedule_edit(self, chat_id, message_id, text, markup):
+        """Debounce edits so rapid clicks on one message collapse into one API call"""
+        key = (chat_id, message_id)
+        with self._edits_lock:
+            pending = self._pending_edits.get(key)
+            if pending:
+                pending[0].cancel()
+            timer = threading.Timer(EDIT_DEBOUNCE, self._flush_edit, args=(key,))
+            timer.daemon = True
+            self._pending_edits[key] = (timer, text, markup)
+            timer.start()
+    
+    @contextmanager
+    def _message_lock(self, key):
+        """Hold the send lock for one message; other messages edit in parallel"""
+        with self._edits_lock:
+            entry = self._send_locks.get(key)
+            if entry is None:
+                entry = self._send_locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            # Drop the lock once nobody holds or waits for it
+            with self._edits_lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._send_locks[key]
+    
+    def _flush_edit(self, key):
+        """Send the latest pending edit for a message"""
+        # Popped and sent under the message's send lock, so a direct edit
+        # can't slip in between and then be overwritten by this older one
+        with self._message_lock(key):
+            with self._edits_lock:
+                pending = self._pending_edits.pop(key, None)
+            if not pending:
+                return
+            
+            _, text, markup = pending
+            try:
+                self.bot.edit_message_text(
+                    text,
+                    key[0],
+                    key[1],
+                    reply_markup=markup,
+                    parse_mode='HTML'
+                )
+            except Exception as e:
+                logger.error(f"Error editing admin message: {e}")
+    
+    def _edit_now(self, chat_id, message_id, text, markup=None):
+        """Edit a message right away, dropping any debounced edit still pending for it"""
+        key = (chat_id, message_id)
+        with self._message_lock(key):
+            with self._edits_lock:
+                pending = self._pending_edits.pop(key, None)
+            if pending:
+                pending[0].cancel()
+            self.bot.edit_message_text(
+                text,
+                chat_id,
+                message_id,
+                reply_markup=markup,
+                parse_mode='HTML'
+            )
+    
     def setup_admin_handlers(self):
         """Setup admin command handlers"""
         
@@ -39,74 +227,95 @@ class AdminPanel:
                 self.bot.reply_to(message, "❌ Access Denied!")
                 return
             
-            keyboard = InlineKeyboardMarkup()
-            keyboard.row(
-                InlineKeyboardButton("📊 Statistics", callback_data="admin_stats"),
-                InlineKeyboardButton("👥 Users", callback_data="admin_users")
-            )
-            keyboard.row(
-                InlineKeyboardButton("📢 Broadcast", callback_data="admin_broadcast"),
-                InlineKeyboardButton("⚙️ Settings", callback_data="admin_settings")
-            )
-            keyboard.row(
-                InlineKeyboardButton("🔗 Force Subscribe", callback_data="admin_force_sub"),
-                InlineKeyboardButton("📥 Downloads", callback_data="admin_downloads")
-            )
-            
             self.bot.send_message(
                 message.chat.id,
-                "🛠️ <b>Admin Panel</b>\n\n"
-                "Choose an option to manage your bot:",
-                reply_markup=keyboard,
+                self._main_menu_text,
+                reply_markup=self._main_menu_kb,
                 parse_mode='HTML'
             )
         
-        @self.bot.callback_query_handler(func=lambda call: call.data.startswith('admin_'))
+        # Callback data -> handler, looked up once per callback
+        self._cb_dispatch = {
+            'admin_stats': self.show_statistics,
+            'admin_users': self.show_users_menu,
+            'admin_broadcast': self.broadcast_menu,
+            'send_broadcast': self.broadcast_prompt,
+            'admin_settings': self.settings_menu,
+            'admin_force_sub': self.force_subscribe_menu,
+            'admin_downloads': self.show_downloads,
+            'back_to_admin': self.back_to_admin,
+            'toggle_status': self.toggle_bot_status,
+            'toggle_maintenance': self.toggle_maintenance,
+            'all_users': self.show_all_users,
+            'export_users': self.export_users,
+            'add_channel': self.add_channel_prompt,
+            'remove_channel': self.remove_channel_menu,
+        }
+        
+        @self.bot.callback_query_handler(
+            func=lambda call: call.data in self._cb_dispatch or call.data.startswith('remove_')
+        )
         def handle_admin_callbacks(call):
             """Handle admin panel callbacks"""
             if not self.is_admin(call.from_user.id):
                 self.bot.answer_callback_query(call.id, "❌ Access Denied!")
                 return
             
-            if call.data == 'admin_stats':
-                self.show_statistics(call)
-            elif call.data == 'admin_users':
-                self.show_users_menu(call)
-            elif call.data == 'admin_broadcast':
-                self.broadcast_menu(call)
-            elif call.data == 'admin_settings':
-                self.settings_menu(call)
-            elif call.data == 'admin_force_sub':
-                self.force_subscribe_menu(call)
-            elif call.data == 'admin_downloads':
-                self.show_downloads(call)
-            elif call.data == 'back_to_admin':
-                self.back_to_admin(call)
-            
-            # Handle setting toggles
-            elif call.data == 'toggle_status':
-                self.toggle_bot_status(call)
-            elif call.data == 'toggle_maintenance':
-                self.toggle_maintenance(call)
-            
-            # Handle user management
-            elif call.data == 'all_users':
-                self.show_all_users(call)
-            elif call.data == 'export_users':
-                self.export_users(call)
+            handler = self._cb_dispatch.get(call.data)
+            args = (call,)
+            if handler is None:
+                handler = self.remove_channel
+                args = (call, call.data[len('remove_'):])
+            elif call.data not in SELF_ACKING_CALLBACKS:
+                # Ack first so the client stops spinning, then do the work
+                self.bot.answer_callback_query(call.id)
             
-            # Handle force subscribe
-            elif call.data == 'add_channel':
-                self.add_channel_prompt(call)
-            elif call.data == 'remove_channel':
-                self.remove_channel_menu(call)
+            self._enqueue(call.message.chat.id, lambda: self._run_callback(handler, *args))
+    
+    def _enqueue(self, chat_id, fn):
+        """Queue work for a chat; chats run in parallel, each one in order"""
+        with self._chat_queues_lock:
+            q = self._chat_queues.get(chat_id)
+            if q is None:
+                q = self._chat_queues[chat_id] = queue.Queue()
+                threading.Thread(
+                    target=self._chat_worker, args=(chat_id, q), daemon=True
+                ).start()
+            q.put(fn)
+    
+    def _chat_worker(self, chat_id, q):
+        """Run one chat's queued callbacks until it has been idle for a while"""
+        try:
+            while True:
+                try:
+                    fn = q.get(timeout=CHAT_WORKER_IDLE)
+                except queue.Empty:
+                    with self._chat_queues_lock:
+                        if q.empty():
+                            del self._chat_queues[chat_id]
+                            return
+                    continue
+                
+                with self._chat_slots:
+                    fn()
+                q.task_done()
+        finally:
+            # This thread is about to exit; don't leave its connection open
+            self.db.release_connection()
+    
+    def _run_callback(self, handler, *args):
+        """Run a callback handler on the worker pool, logging failures"""
+        try:
+            handler(*args)
+        except Exception as e:
+            logger.error(f"Admin callback error: {e}")
     
     def show_statistics(self, call):
         """Show bot statistics"""
-        stats = self.db.get_bot_stats()
-        recent_downloads = self.db.get_recent_downloads(5)
+        stats = self._cached('bot_stats', self.db.get_bot_stats)
+        recent_downloads = self._cached(('recent_downloads', 5), lambda: self.db.get_recent_downloads(5))
         
-        stats_text = f"""
+        parts = [f"""
 📊 <b>Bot Statistics</b>
 
 👥 <b>Users:</b>
@@ -118,120 +327,218 @@ class AdminPanel:
 • Today Downloads: {stats.get('today_downloads', 0)}
 
 🕒 <b>Recent Downloads:</b>
-"""
+"""]
         
         for i, download in enumerate(recent_downloads, 1):
-            stats_text += f"{i}. {download['file_name']} - {download['user_name']}\n"
-        
-        keyboard = InlineKeyboardMarkup()
-        keyboard.add(InlineKeyboardButton("🔄 Refresh", callback_data="admin_stats"))
-        keyboard.add(InlineKeyboardButton("⬅️ Back", callback_data="back_to_admin"))
+            parts.append(f"{i}. {download['file_name']} - {download['user_name']}\n")
         
-        self.bot.edit_message_text(
-            stats_text,
+        self._schedule_edit(
             call.message.chat.id,
             call.message.message_id,
-            reply_markup=keyboard,
-            parse_mode='HTML'
+            ''.join(parts),
+            self._stats_kb
         )
     
     def show_users_menu(self, call):
         """Show users management menu"""
-        total_users = self.db.get_total_users()
-        recent_users = self.db.get_all_users()[:5]
+        total_users = self._cached('total_users', self.db.get_total_users)
+        recent_users = self._cached(('recent_users', 5), lambda: self.db.get_recent_users(5))
         
-        users_text = f"""
+        parts = [f"""
 👥 <b>Users Management</b>
 
 • Total Users: {total_users}
 
 <b>Recent Users:</b>
-"""
+"""]
         
         for i, user in enumerate(recent_users, 1):
             username = f"@{user['username']}" if user['username'] else "No username"
-            users_text += f"{i}. {user['first_name']} ({username}) - {user['download_count']} downloads\n"
+            parts.append(f"{i}. {user['first_name']} ({username}) - {user['download_count']} downloads\n")
         
-        keyboard = InlineKeyboardMarkup()
-        keyboard.row(
-            InlineKeyboardButton("📜 All Users", callback_data="all_users"),
-            InlineKeyboardButton("📧 Export Users", callback_data="export_users")
-        )
-        keyboard.add(InlineKeyboardButton("⬅️ Back", callback_data="back_to_admin"))
-        
-        self.bot.edit_message_text(
-            users_text,
+        self._edit_now(
             call.message.chat.id,
             call.message.message_id,
-            reply_markup=keyboard,
-            parse_mode='HTML'
+            ''.join(parts),
+            self._users_kb
         )
     
     def show_all_users(self, call):
         """Show all users with pagination"""
-        users = self.db.get_all_users()
+        users, total = self._cached(('users_page', 0, 50), lambda: self.db.get_users_page(0, 50))
         
-        users_text = f"👥 <b>All Users ({len(users)})</b>\n\n"
+        parts = [f"👥 <b>All Users ({total})</b>\n\n"]
         
-        for i, user in enumerate(users[:50], 1):  # Show first 50 users
+        for i, user in enumerate(users, 1):  # Show first 50 users
             username = f"@{user['username']}" if user['username'] else "No username"
-            users_text += f"{i}. {user['first_name']} ({username}) - {user['download_count']} downloads\n"
+            parts.append(f"{i}. {user['first_name']} ({username}) - {user['download_count']} downloads\n")
         
-        if len(users) > 50:
-            users_text += f"\n... and {len(users) - 50} more users"
-        
-        keyboard = InlineKeyboardMarkup()
-        keyboard.add(InlineKeyboardButton("⬅️ Back", callback_data="admin_users"))
+        if total > 50:
+            parts.append(f"\n... and {total - 50} more users")
         
-        self.bot.edit_message_text(
-            users_text,
+        self._edit_now(
             call.message.chat.id,
             call.message.message_id,
-            reply_markup=keyboard,
-            parse_mode='HTML'
+            ''.join(parts),
+            self._all_users_kb
         )
     
     def export_users(self, call):
         """Export users data"""
-        users = self.db.get_all_users()
+        # Stream CSV rows straight into a byte buffer
+        buf = io.BytesIO()
+        text = io.TextIOWrapper(buf, encoding='utf-8', newline='', write_through=True)
+        writer = csv.writer(text, lineterminator='\n')
+        writer.writerow(['User ID', 'Username', 'First Name', 'Join Date', 'Downloads'])
         
-        if not users:
-            self.bot.answer_callback_query(call.id, "No users to export!")
+        count = 0
+        try:
+            for user in self.db.iter_all_users(chunk=1000):
+                writer.writerow([
+                    user['user_id'], user['username'] or 'N/A', user['first_name'],
+                    user['join_date'], user['download_count']
+                ])
+                count += 1
+        except Exception as e:
+            # Don't send a partial file as if it were the full export
+            logger.error(f"Error exporting users: {e}")
+            self.bot.answer_callback_query(call.id, "❌ Export failed!")
             return
+        text.detach()
         
-        # Create CSV data
-        csv_data = "User ID,Username,First Name,Join Date,Downloads\n"
-        for user in users:
-            csv_data += f"{user['user_id']},{user['username'] or 'N/A'},{user['first_name']},{user['join_date']},{user['download_count']}\n"
+        if not count:
+            self.bot.answer_callback_query(call.id, "No users to export!")
+            return
         
         # Send as file
+        buf.seek(0)
         self.bot.send_document(
             call.message.chat.id,
-            ('users.csv', csv_data.encode()),
-            caption=f"📊 Users Export - {len(users)} users"
+            ('users.csv', buf),
+            caption=f"📊 Users Export - {count} users"
         )
         self.bot.answer_callback_query(call.id, "Users data exported!")
     
     def broadcast_menu(self, call):
         """Broadcast message menu"""
-        keyboard = InlineKeyboardMarkup()
-        keyboard.add(InlineKeyboardButton("📢 Send Broadcast", callback_data="send_broadcast"))
-        keyboard.add(InlineKeyboardButton("⬅️ Back", callback_data="back_to_admin"))
-        
-        self.bot.edit_message_text(
+        self._edit_now(
+            call.message.chat.id,
+            call.message.message_id,
             "📢 <b>Broadcast Message</b>\n\n"
             "Send a message to all users. Use this feature carefully!",
+            self._broadcast_kb
+        )
+    
+    def broadcast_prompt(self, call):
+        """Ask for the message to broadcast"""
+        self._edit_now(
             call.message.chat.id,
             call.message.message_id,
-            reply_markup=keyboard,
-            parse_mode='HTML'
+            "📢 <b>Send Broadcast</b>\n\n"
+            "Send the message you want to broadcast to all users:"
         )
+        
+        self.bot.register_next_step_handler(call.message, self.process_broadcast)
+    
+    def process_broadcast(self, message):
+        """Start broadcasting the admin's message in the background"""
+        if not self.is_admin(message.from_user.id):
+            return
+        
+        status = self.bot.reply_to(message, "📢 Broadcast started...")
+        threading.Thread(
+            target=self.run_broadcast,
+            args=(message.chat.id, message.message_id, status.message_id),
+            daemon=True
+        ).start()
+    
+    def _wait_for_send_slot(self):
+        """Token bucket: block until the next broadcast send is allowed"""
+        with self._send_slot_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_send_at)
+            self._next_send_at = slot + 1 / BROADCAST_RATE
+        if slot > now:
+            time.sleep(slot - now)
+    
+    def _send_broadcast_copy(self, user_id, from_chat_id, message_id):
+        """Copy the broadcast to one user, retrying once on flood wait"""
+        for attempt in range(2):
+            self._wait_for_send_slot()
+            try:
+                self.bot.copy_message(user_id, from_chat_id, message_id)
+                return True
+            except telebot.apihelper.ApiTelegramException as e:
+                retry_after = (e.result_json or {}).get('parameters', {}).get('retry_after')
+                if not retry_after or attempt:
+                    return False
+                time.sleep(retry_after)
+            except Exception as e:
+                logger.error(f"Broadcast error for {user_id}: {e}")
+                return False
+        return False
+    
+    def run_broadcast(self, chat_id, message_id, status_message_id):
+        """Send a message to every user at a rate Telegram accepts"""
+        # User IDs stream from SQLite as workers free up, through a small
+        # bounded queue, instead of loading the whole user list first
+        pending = queue.Queue(maxsize=BROADCAST_WORKERS * 4)
+        counts = {'sent': 0, 'failed': 0}
+        counts_lock = threading.Lock()
+        
+        def worker():
+            while True:
+                user_id = pending.get()
+                if user_id is None:
+                    return
+                outcome = 'sent' if self._send_broadcast_copy(user_id, chat_id, message_id) else 'failed'
+                with counts_lock:
+                    counts[outcome] += 1
+        
+        workers = [threading.Thread(target=worker, daemon=True) for _ in range(BROADCAST_WORKERS)]
+        for thread in workers:
+            thread.start()
+        feed_error = None
+        try:
+            for user_id in self.db.iter_user_ids():
+                pending.put(user_id)
+        except Exception as e:
+            logger.error(f"Error reading broadcast recipients: {e}")
+            feed_error = e
+        finally:
+            # One thread per broadcast; close its connection once the feed is done
+            self.db.release_connection()
+        for _ in workers:
+            pending.put(None)
+        for thread in workers:
+            thread.join()
+        
+        if feed_error is None:
+            title = "📢 <b>Broadcast Finished</b>\n\n"
+        else:
+            title = (
+                "⚠️ <b>Broadcast Stopped</b>\n\n"
+                "User list पढ़ते समय error आया, कुछ users को message नहीं गया।\n\n"
+            )
+        try:
+            self.bot.edit_message_text(
+                title +
+                f"✅ Sent: {counts['sent']}\n"
+                f"❌ Failed: {counts['failed']}",
+                chat_id,
+                status_message_id,
+                parse_mode='HTML'
+            )
+        except Exception as e:
+            logger.error(f"Error updating broadcast status: {e}")
     
     def settings_menu(self, call):
         """Bot settings menu"""
-        bot_status = self.db.get_setting('bot_status', 'active')
-        maintenance = self.db.get_setting('maintenance_mode', 'false')
-        max_size = self.db.get_setting('max_file_size', '2GB')
+        defaults = {'bot_status': 'active', 'maintenance_mode': 'false', 'max_file_size': '2GB'}
+        settings = self._cached('settings', lambda: self.db.get_settings(tuple(defaults)))
+        bot_status = settings.get('bot_status', defaults['bot_status'])
+        maintenance = settings.get('maintenance_mode', defaults['maintenance_mode'])
+        max_size = settings.get('max_file_size', defaults['max_file_size'])
         
         keyboard = InlineKeyboardMarkup()
         keyboard.row(
@@ -242,15 +549,14 @@ class AdminPanel:
             InlineKeyboardButton(f"Max Size: {max_size}", callback_data="change_max_size"),
             InlineKeyboardButton("Edit Welcome", callback_data="edit_welcome")
         )
-        keyboard.add(InlineKeyboardButton("⬅️ Back", callback_data="back_to_admin"))
+        keyboard.add(self._back_btn)
         
-        self.bot.edit_message_text(
-            "⚙️ <b>Bot Settings</b>\n\n"
-            "Configure your bot settings:",
+        self._edit_now(
             call.message.chat.id,
             call.message.message_id,
-            reply_markup=keyboard,
-            parse_mode='HTML'
+            "⚙️ <b>Bot Settings</b>\n\n"
+            "Configure your bot settings:",
+            keyboard
         )
     
     def toggle_bot_status(self, call):
@@ -259,6 +565,7 @@ class AdminPanel:
         new_status = 'inactive' if current_status == 'active' else 'active'
         
         self.db.update_setting('bot_status', new_status)
+        self.invalidate_cache()
         
         self.bot.answer_callback_query(call.id, f"Bot status changed to {new_status}")
         self.settings_menu(call)
@@ -269,6 +576,7 @@ class AdminPanel:
         new_mode = 'true' if current_mode == 'false' else 'false'
         
         self.db.update_setting('maintenance_mode', new_mode)
+        self.invalidate_cache()
         
         mode_text = "enabled" if new_mode == 'true' else "disabled"
         self.bot.answer_callback_query(call.id, f"Maintenance mode {mode_text}")
@@ -276,34 +584,28 @@ class AdminPanel:
     
     def force_subscribe_menu(self, call):
         """Force subscribe management menu"""
-        channels = self.db.get_force_subscribe_channels()
+        channels = self._cached('channels', self.db.get_force_subscribe_channels)
         
-        channels_text = "🔗 <b>Force Subscribe Channels</b>\n\n"
+        parts = ["🔗 <b>Force Subscribe Channels</b>\n\n"]
         
         if channels:
             for i, channel in enumerate(channels, 1):
-                channels_text += f"{i}. {channel['channel_name']} ({channel['channel_id']})\n"
+                parts.append(f"{i}. {channel['channel_name']} ({channel['channel_id']})\n")
         else:
-            channels_text += "No channels added yet.\n"
-        
-        keyboard = InlineKeyboardMarkup()
-        keyboard.row(
-            InlineKeyboardButton("➕ Add Channel", callback_data="add_channel"),
-            InlineKeyboardButton("➖ Remove Channel", callback_data="remove_channel")
-        )
-        keyboard.add(InlineKeyboardButton("⬅️ Back", callback_data="back_to_admin"))
+            parts.append("No channels added yet.\n")
         
-        self.bot.edit_message_text(
-            channels_text,
+        self._edit_now(
             call.message.chat.id,
             call.message.message_id,
-            reply_markup=keyboard,
-            parse_mode='HTML'
+            ''.join(parts),
+            self._force_sub_kb
         )
     
     def add_channel_prompt(self, call):
         """Prompt to add channel"""
-        self.bot.edit_message_text(
+        self._edit_now(
+            call.message.chat.id,
+            call.message.message_id,
             "🔗 <b>Add Force Subscribe Channel</b>\n\n"
             "Please send channel information in this format:\n"
             "<code>channel_id channel_name channel_link</code>\n\n"
@@ -313,10 +615,7 @@ class AdminPanel:
             "1. Add your bot to the channel as admin\n"
             "2. Send any message in channel\n"
             "3. Forward that message to @userinfobot\n"
-            "4. Copy the channel ID (starts with -100)",
-            call.message.chat.id,
-            call.message.message_id,
-            parse_mode='HTML'
+            "4. Copy the channel ID (starts with -100)"
         )
         
         # Register next step handler
@@ -339,6 +638,7 @@ class AdminPanel:
             
             # Add channel to database
             if self.db.add_force_subscribe_channel(channel_id, channel_name, channel_link):
+                self.invalidate_cache()
                 self.bot.reply_to(message, f"✅ Channel '{channel_name}' added successfully!")
             else:
                 self.bot.reply_to(message, "❌ Failed to add channel!")
@@ -348,7 +648,7 @@ class AdminPanel:
     
     def remove_channel_menu(self, call):
         """Show remove channel menu"""
-        channels = self.db.get_force_subscribe_channels()
+        channels = self._cached('channels', self.db.get_force_subscribe_channels)
         
         if not channels:
             self.bot.answer_callback_query(call.id, "No channels to remove!")
@@ -363,74 +663,66 @@ class AdminPanel:
         
         keyboard.add(InlineKeyboardButton("⬅️ Back", callback_data="admin_force_sub"))
         
-        self.bot.edit_message_text(
-            "🔗 <b>Remove Force Subscribe Channel</b>\n\n"
-            "Select a channel to remove:",
+        self.bot.answer_callback_query(call.id)
+        self._edit_now(
             call.message.chat.id,
             call.message.message_id,
-            reply_markup=keyboard,
-            parse_mode='HTML'
+            "🔗 <b>Remove Force Subscribe Channel</b>\n\n"
+            "Select a channel to remove:",
+            keyboard
         )
     
+    def remove_channel(self, call, channel_id):
+        """Remove a force subscribe channel picked from the menu"""
+        if self.db.remove_force_subscribe_channel(channel_id):
+            self.invalidate_cache()
+            self.bot.answer_callback_query(call.id, "✅ Channel removed!")
+        else:
+            self.bot.answer_callback_query(call.id, "❌ Failed to remove channel!")
+        
+        self.force_subscribe_menu(call)
+    
     def show_downloads(self, call):
         """Show recent downloads"""
-        downloads = self.db.get_recent_downloads(10)
+        downloads = self._cached(('recent_downloads', 10), lambda: self.db.get_recent_downloads(10))
         
-        downloads_text = "📥 <b>Recent Downloads</b>\n\n"
+        parts = ["📥 <b>Recent Downloads</b>\n\n"]
         
         for i, download in enumerate(downloads, 1):
-            downloads_text += f"{i}. <b>{download['file_name']}</b>\n"
-            downloads_text += f"   👤 {download['user_name']} | 💾 {download['file_size']}\n"
-            downloads_text += f"   🕒 {download['download_date']}\n\n"
-        
-        keyboard = InlineKeyboardMarkup()
-        keyboard.add(InlineKeyboardButton("🔄 Refresh", callback_data="admin_downloads"))
-        keyboard.add(InlineKeyboardButton("⬅️ Back", callback_data="back_to_admin"))
+            parts.append(
+                f"{i}. <b>{download['file_name']}</b>\n"
+                f"   👤 {download['user_name']} | 💾 {download['file_size']}\n"
+                f"   🕒 {download['download_date']}\n\n"
+            )
         
-        self.bot.edit_message_text(
-            downloads_text,
+        self._schedule_edit(
             call.message.chat.id,
             call.message.message_id,
-            reply_markup=keyboard,
-            parse_mode='HTML'
+            ''.join(parts),
+            self._downloads_kb
         )
     
     def back_to_admin(self, call):
         """Back to admin main menu"""
-        keyboard = InlineKeyboardMarkup()
-        keyboard.row(
-            InlineKeyboardButton("📊 Statistics", callback_data="admin_stats"),
-            InlineKeyboardButton("👥 Users", callback_data="admin_users")
-        )
-        keyboard.row(
-            InlineKeyboardButton("📢 Broadcast", callback_data="admin_broadcast"),
-            InlineKeyboardButton("⚙️ Settings", callback_data="admin_settings")
-        )
-        keyboard.row(
-            InlineKeyboardButton("🔗 Force Subscribe", callback_data="admin_force_sub"),
-            InlineKeyboardButton("📥 Downloads", callback_data="admin_downloads")
-        )
-        
-        self.bot.edit_message_text(
-            "🛠️ <b>Admin Panel</b>\n\n"
-            "Choose an option to manage your bot:",
+        self._schedule_edit(
             call.message.chat.id,
             call.message.message_id,
-            reply_markup=keyboard,
-            parse_mode='HTML'
+            self._main_menu_text,
+            self._main_menu_kb
         )
     
     def start_admin_panel(self):
         """Start the admin panel"""
         logger.info("Admin panel started")
-        try:
-            self.bot.polling(none_stop=True)
-        except Exception as e:
-            logger.error(f"Admin panel error: {e}")
-            # Restart after delay
-            import time
-            time.sleep(10)
-            self.start_admin_panel()
+        backoff = 1
+        while True:
+            try:
+                self.bot.polling(none_stop=True)
+                return
+            except Exception as e:
+                logger.error(f"Admin panel error: {e}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 300)
 
 # Usage - Environment variables se automatically fetch hoga
 if __name__ == "__main__":
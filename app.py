@@ -1,6 +1,9 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, abort
 import threading
+import queue
+import time
 import os
+import telebot
 from main import bot, db
 from admin import AdminPanel
 
@@ -9,55 +12,139 @@ app = Flask(__name__)
 # Environment variables से automatically fetch हो जाएगा
 BOT_TOKEN = os.getenv('BOT_TOKEN')
 ADMIN_IDS = os.getenv('ADMIN_IDS', '').split(',')
+ADMIN_BOT_TOKEN = os.getenv('ADMIN_BOT_TOKEN')
+PUBLIC_URL = os.getenv('PUBLIC_URL', '').rstrip('/')
+USE_POLLING = os.getenv('USE_POLLING', '').lower() in ('1', 'true', 'yes')
 
-# Initialize admin panel with environment variables
-admin_panel = AdminPanel(BOT_TOKEN, ADMIN_IDS)
+# Seconds the homepage stats are reused before querying SQLite again
+STATS_TTL = 30
+_stats_cache = {"t": 0.0, "v": None}
+_stats_lock = threading.Lock()
+
+HEALTH = {"status": "healthy", "bot": "running"}
+HOME_STATIC = {"status": "Bot is running", "bot_token_set": bool(BOT_TOKEN)}
+
+# Webhook bodies are queued raw so Telegram gets its 200 immediately;
+# worker threads decode them and pass them to the bot in batches
+UPDATE_QUEUE_SIZE = 1024
+UPDATE_WORKERS = 4
+UPDATE_BATCH_SIZE = 32
+UPDATE_BATCH_WAIT = 0.1
+update_queue = queue.Queue(maxsize=UPDATE_QUEUE_SIZE)
+_Update = telebot.types.Update
+
+# Admin handlers share the main bot's polling loop and DB, unless a
+# separate admin bot token is configured
+SEPARATE_ADMIN_BOT = bool(ADMIN_BOT_TOKEN) and ADMIN_BOT_TOKEN != BOT_TOKEN
+if SEPARATE_ADMIN_BOT:
+    admin_panel = AdminPanel(ADMIN_BOT_TOKEN, ADMIN_IDS, db=db)
+    # The webhook only serves the main bot, so the admin bot long-polls.
+    # Started at import so it also runs under gunicorn; Telegram allows one
+    # poller per token, so gunicorn must run a single worker process
+    threading.Thread(target=admin_panel.start_admin_panel, name='admin-bot', daemon=True).start()
+else:
+    admin_panel = AdminPanel(admin_ids=ADMIN_IDS, bot=bot, db=db)
+
+def cached_stats():
+    """Bot stats, refreshed at most once per STATS_TTL"""
+    now = time.monotonic()
+    if _stats_cache["v"] is not None and now - _stats_cache["t"] <= STATS_TTL:
+        return _stats_cache["v"]
+    
+    # One thread refreshes; concurrent requests wait and reuse its result
+    with _stats_lock:
+        now = time.monotonic()
+        if _stats_cache["v"] is None or now - _stats_cache["t"] > STATS_TTL:
+            _stats_cache.update(v=db.get_bot_stats(), t=now)
+        return _stats_cache["v"]
+
+def update_worker():
+    """Decode queued webhook bodies and process up to UPDATE_BATCH_SIZE at once"""
+    while True:
+        batch = [update_queue.get()]
+        deadline = time.monotonic() + UPDATE_BATCH_WAIT
+        while len(batch) < UPDATE_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(update_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        updates = []
+        for raw in batch:
+            try:
+                updates.append(_Update.de_json(raw))
+            except Exception as e:
+                print(f"Bad update: {e}")
+        try:
+            bot.process_new_updates(updates)
+        except Exception as e:
+            print(f"Update processing error: {e}")
+
+for _ in range(UPDATE_WORKERS):
+    threading.Thread(target=update_worker, daemon=True).start()
 
 @app.route('/')
 def home():
-    stats = db.get_bot_stats()
-    return jsonify({
-        "status": "Bot is running",
-        "stats": stats,
-        "bot_token_set": bool(BOT_TOKEN),
-        "admin_ids": ADMIN_IDS
-    })
+    resp = jsonify({**HOME_STATIC, "stats": cached_stats()})
+    resp.headers['Cache-Control'] = 'max-age=30'
+    return resp
 
 @app.route('/health')
 def health():
-    return jsonify({"status": "healthy", "bot": "running"})
+    return jsonify(HEALTH)
 
-def run_bot():
-    """Run the bot in polling mode"""
+@app.route('/webhook/<token>', methods=['POST'])
+def webhook(token):
+    """Receive updates pushed by Telegram"""
+    if token != BOT_TOKEN:
+        abort(403)
     try:
-        bot.polling(none_stop=True)
-    except Exception as e:
-        print(f"Bot error: {e}")
-        # Restart after delay
-        time.sleep(10)
-        run_bot()
+        update_queue.put_nowait(request.get_data(as_text=True))
+    except queue.Full:
+        # Telegram redelivers updates that weren't acknowledged
+        abort(503)
+    return '', 200
 
-def run_admin():
-    """Run the admin panel"""
+def setup_webhook():
+    """Point Telegram at our webhook instead of long polling"""
     try:
-        admin_panel.start_admin_panel()
+        bot.remove_webhook()
+        bot.set_webhook(url=f"{PUBLIC_URL}/webhook/{BOT_TOKEN}")
+        print(f"🔗 Webhook set: {PUBLIC_URL}/webhook/<token>")
     except Exception as e:
-        print(f"Admin panel error: {e}")
-        # Restart after delay
-        time.sleep(10)
-        run_admin()
+        print(f"Webhook setup error: {e}")
+
+# Register at import time so it also happens under gunicorn
+if not USE_POLLING:
+    if PUBLIC_URL:
+        setup_webhook()
+    else:
+        print("⚠️ PUBLIC_URL not set - set it (or USE_POLLING=1) to receive updates")
+
+def run_bot():
+    """Run the bot in polling mode, restarting with backoff on errors"""
+    backoff = 1
+    while True:
+        try:
+            bot.polling(none_stop=True)
+            return
+        except Exception as e:
+            print(f"Bot error: {e}")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 300)
 
 if __name__ == '__main__':
     print("🚀 Starting Terabox Bot...")
     print(f"📊 Bot Token: {'Set' if BOT_TOKEN else 'Not Set'}")
     print(f"👑 Admin IDs: {ADMIN_IDS}")
     
-    # Start bot and admin in separate threads
-    bot_thread = threading.Thread(target=run_bot, daemon=True)
-    admin_thread = threading.Thread(target=run_admin, daemon=True)
-    
-    bot_thread.start()
-    admin_thread.start()
+    # Polling is opt-in (local development); production uses the webhook
+    if USE_POLLING:
+        bot_thread = threading.Thread(target=run_bot, daemon=True)
+        bot_thread.start()
     
     # Run Flask app
     port = int(os.environ.get('PORT', 5000))
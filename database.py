@@ -1,20 +1,101 @@
 import sqlite3
 import json
+import queue
+import atexit
 import logging
-from datetime import datetime, timedelta
+import threading
+import time
+from concurrent.futures import Future
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 import os
 
 logger = logging.getLogger(__name__)
 
+# Most queued writes the writer thread commits in one transaction
+WRITE_BATCH_SIZE = 32
+
+# Seconds a cached setting is trusted; bounds staleness when another
+# process (e.g. a second gunicorn worker) changes it
+SETTINGS_TTL = 5
+
+# Seconds between incremental_vacuum/ANALYZE runs
+MAINTENANCE_INTERVAL = 24 * 60 * 60
+
+# Seconds after startup before the first maintenance run, so it stays out
+# of the way of boot and the first burst of updates
+MAINTENANCE_STARTUP_DELAY = 60
+
+# Seconds the force-subscribe channel list is reused; add/remove in this
+# process invalidate it immediately
+CHANNELS_TTL = 30
+
+# Users whose profile add_user remembers, to skip redundant upserts
+USER_CACHE_SIZE = 10000
+
+# Cached marker for settings that have no row
+_MISSING = object()
+
 class DatabaseManager:
+    # Hot-path SQL kept as constants so every call hits the statement cache
+    SQL_UPSERT_USER = '''
+        INSERT INTO users (user_id, username, first_name, last_name, last_active)
+        VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(user_id) DO UPDATE SET
+            username = excluded.username,
+            first_name = excluded.first_name,
+            last_name = excluded.last_name,
+            last_active = CURRENT_TIMESTAMP
+    '''
+    SQL_UPDATE_ACTIVITY = '''
+        UPDATE users 
+        SET last_active = CURRENT_TIMESTAMP, 
+            download_count = download_count + 1
+        WHERE user_id = ?
+    '''
+    SQL_INSERT_DOWNLOAD = '''
+        INSERT INTO downloads (user_id, file_name, file_size, status)
+        VALUES (?, ?, ?, ?)
+    '''
+    # Keeps get_bot_stats O(1): a running total plus one row per UTC day
+    SQL_COUNT_DOWNLOADS = '''
+        INSERT INTO counters (name, value)
+        VALUES ('total_downloads', ?), ('downloads:' || DATE('now'), ?)
+        ON CONFLICT(name) DO UPDATE SET value = value + excluded.value
+    '''
+    SQL_GET_SETTING = '''
+        SELECT setting_value FROM admin_settings WHERE setting_key = ?
+    '''
+    
     def __init__(self, db_path="terabox_bot.db"):
         self.db_path = db_path
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._settings_cache = {}
+        self._settings_lock = threading.Lock()
+        # Bumped on every write, so a read that raced a write isn't cached
+        self._settings_generation = {}
+        self._channels_cache = None
+        self._channels_lock = threading.Lock()
+        self._channels_generation = 0
+        self._known_users = OrderedDict()
+        self._known_users_lock = threading.Lock()
+        atexit.register(self.close_all)
         self.init_database()
+        
+        # All writes go through one thread, so they never contend for SQLite's
+        # write lock; reads keep using the per-thread connections
+        self._write_queue = queue.Queue()
+        self._writer_thread = threading.Thread(target=self._writer, name='db-writer', daemon=True)
+        self._writer_thread.start()
+        
+        threading.Thread(target=self._maintenance_loop, name='db-maintenance', daemon=True).start()
     
     def init_database(self):
         """Initialize database tables"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.get_connection()
             cursor = conn.cursor()
             
             # Users table
@@ -65,6 +146,21 @@ class DatabaseManager:
                 )
             ''')
             
+            # Pre-aggregated download counters (see SQL_COUNT_DOWNLOADS)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            
+            # Indexes for the stats date ranges, newest-users listings and
+            # the downloads/users join
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_last_active ON users(last_active)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_join_date ON users(join_date)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_downloads_date ON downloads(download_date)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_downloads_user ON downloads(user_id)')
+            
             # Insert default settings
             default_settings = [
                 ('bot_status', 'active'),
@@ -74,38 +170,195 @@ class DatabaseManager:
                 ('broadcast_message', ''),
             ]
             
-            for key, value in default_settings:
-                cursor.execute('''
-                    INSERT OR IGNORE INTO admin_settings (setting_key, setting_value)
-                    VALUES (?, ?)
-                ''', (key, value))
+            cursor.execute('BEGIN')
+            cursor.executemany('''
+                INSERT OR IGNORE INTO admin_settings (setting_key, setting_value)
+                VALUES (?, ?)
+            ''', default_settings)
+            
+            # Back-fill counters once for databases that predate them
+            cursor.execute('''
+                INSERT OR IGNORE INTO counters (name, value)
+                SELECT 'total_downloads', COUNT(*) FROM downloads
+            ''')
+            cursor.execute('''
+                INSERT OR IGNORE INTO counters (name, value)
+                SELECT 'downloads:' || DATE('now'), COUNT(*) FROM downloads
+                WHERE download_date >= DATE('now') AND download_date < DATE('now', '+1 day')
+            ''')
             
             conn.commit()
-            conn.close()
             logger.info("Database initialized successfully")
             
         except Exception as e:
             logger.error(f"Database initialization error: {e}")
     
+    def _configure(self, conn):
+        """Apply per-connection performance pragmas"""
+        conn.row_factory = sqlite3.Row
+        # auto_vacuum only takes effect on a new, empty database (existing files
+        # keep their mode until a full VACUUM), so it must precede journal_mode.
+        # Both are stored in the database file; the rest are per connection
+        conn.executescript('''
+            PRAGMA auto_vacuum=INCREMENTAL;
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+            PRAGMA cache_size=-65536;
+            PRAGMA busy_timeout=30000;
+        ''')
+    
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get this thread's database connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+            self._configure(conn)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    def release_connection(self):
+        """Close this thread's connection; short-lived threads call it before exiting"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._connections_lock:
+            try:
+                self._connections.remove(conn)
+            except ValueError:
+                pass  # Already taken by close_all
+        try:
+            conn.close()
+        except Exception as e:
+            logger.error(f"Error closing connection: {e}")
+    
+    def close_all(self):
+        """Close every per-thread connection (called at interpreter exit)"""
+        # Let the writer commit what's already queued before its connection goes
+        writer = getattr(self, '_writer_thread', None)
+        if writer is not None and writer.is_alive():
+            self._write_queue.put(None)
+            writer.join(timeout=10)
+        
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.error(f"Error closing connection: {e}")
+    
+    def _submit_write(self, *statements):
+        """Queue (sql, params) statements to run together on the writer thread;
+        the Future resolves to the last statement's rowcount"""
+        future = Future()
+        self._write_queue.put((statements, future))
+        return future
+    
+    def _writer(self):
+        """Apply queued writes, committing up to WRITE_BATCH_SIZE of them at a time"""
+        conn = self.get_connection()
+        stopping = False
+        while not stopping:
+            batch = []
+            item = self._write_queue.get()
+            while True:
+                if item is None:
+                    # close_all() asked us to stop once the queue is drained
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= WRITE_BATCH_SIZE:
+                    break
+                try:
+                    item = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+            if not batch:
+                continue
+            
+            results = []
+            try:
+                conn.execute('BEGIN')
+                for statements, future in batch:
+                    # A savepoint per write so one failure doesn't undo the others
+                    conn.execute('SAVEPOINT write_op')
+                    try:
+                        rowcount = 0
+                        for sql, params in statements:
+                            rowcount = conn.execute(sql, params).rowcount
+                        conn.execute('RELEASE write_op')
+                        results.append((future, rowcount, None))
+                    except Exception as e:
+                        conn.execute('ROLLBACK TO write_op')
+                        conn.execute('RELEASE write_op')
+                        results.append((future, None, e))
+                conn.commit()
+            except Exception as e:
+                logger.error(f"Error committing write batch: {e}")
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                results = [(future, None, e) for _, future in batch]
+            
+            for future, rowcount, error in results:
+                if error is None:
+                    future.set_result(rowcount)
+                else:
+                    future.set_exception(error)
+    
+    def maintenance(self):
+        """Return free pages to the OS and refresh query planner statistics"""
+        try:
+            conn = self.get_connection()
+            # executescript runs incremental_vacuum to completion; a plain
+            # execute() stops after the first page
+            conn.executescript('''
+                PRAGMA incremental_vacuum;
+                ANALYZE;
+            ''')
+        except Exception as e:
+            logger.error(f"Database maintenance error: {e}")
+    
+    def _maintenance_loop(self):
+        """Run maintenance() soon after startup, then every MAINTENANCE_INTERVAL seconds"""
+        # Restarts (redeploys, idle spin-down) would otherwise keep resetting a
+        # full-day wait, so maintenance might never run
+        time.sleep(MAINTENANCE_STARTUP_DELAY)
+        while True:
+            self.maintenance()
+            time.sleep(MAINTENANCE_INTERVAL)
+    
+    def _log_failed_write(self, future):
+        """Done-callback for writes nobody waits on"""
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Error in queued write: {error}")
     
     # User management methods
     def add_user(self, user_id, username, first_name, last_name):
         """Add new user to database"""
+        # Same profile already written today (UTC): last_active is current to
+        # the day the stats count by, so the upsert would change nothing useful
+        state = (username, first_name, last_name, datetime.now(timezone.utc).date())
+        with self._known_users_lock:
+            if self._known_users.get(user_id) == state:
+                self._known_users.move_to_end(user_id)
+                return True
+        
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO users 
-                (user_id, username, first_name, last_name, last_active)
-                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (user_id, username, first_name, last_name))
-            
-            conn.commit()
-            conn.close()
+            # Upsert keeps join_date, download_count and is_banned of existing users
+            self._submit_write((self.SQL_UPSERT_USER, (user_id, username, first_name, last_name))).result()
+            with self._known_users_lock:
+                self._known_users[user_id] = state
+                self._known_users.move_to_end(user_id)
+                if len(self._known_users) > USER_CACHE_SIZE:
+                    self._known_users.popitem(last=False)
             return True
         except Exception as e:
             logger.error(f"Error adding user: {e}")
@@ -114,18 +367,7 @@ class DatabaseManager:
     def update_user_activity(self, user_id):
         """Update user last activity"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                UPDATE users 
-                SET last_active = CURRENT_TIMESTAMP, 
-                    download_count = download_count + 1
-                WHERE user_id = ?
-            ''', (user_id,))
-            
-            conn.commit()
-            conn.close()
+            self._submit_write((self.SQL_UPDATE_ACTIVITY, (user_id,))).result()
             return True
         except Exception as e:
             logger.error(f"Error updating user activity: {e}")
@@ -143,52 +385,107 @@ class DatabaseManager:
             ''', (user_id,))
             
             user = cursor.fetchone()
-            conn.close()
             
             if user:
-                return {
-                    'user_id': user[0],
-                    'username': user[1],
-                    'first_name': user[2],
-                    'join_date': user[3],
-                    'download_count': user[4],
-                    'last_active': user[5]
-                }
+                return dict(user)
             return None
         except Exception as e:
             logger.error(f"Error getting user stats: {e}")
             return None
     
     def get_all_users(self):
-        """Get all users"""
+        """Get all users (prefer iter_all_users for large tables)"""
+        try:
+            return list(self.iter_all_users())
+        except Exception as e:
+            logger.error(f"Error getting all users: {e}")
+            return []
+    
+    def iter_all_users(self, chunk=1000):
+        """Yield all users, fetching rows from the cursor in chunks.
+        
+        Errors propagate, so callers can tell a partial read from a full one.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT user_id, username, first_name, join_date, download_count, last_active
+            FROM users ORDER BY join_date DESC
+        ''')
+        
+        while True:
+            users = cursor.fetchmany(chunk)
+            if not users:
+                break
+            for user in users:
+                yield dict(user)
+    
+    def iter_user_ids(self, chunk=500):
+        """Yield every user_id, one short keyset-paged query per chunk.
+        
+        Errors propagate, so callers can tell a partial read from a full one.
+        """
+        # Separate statements per page, so a slow consumer (e.g. a broadcast)
+        # never holds one read transaction open and stalls WAL checkpoints
+        last_id = None
+        conn = self.get_connection()
+        while True:
+            if last_id is None:
+                rows = conn.execute(
+                    'SELECT user_id FROM users ORDER BY user_id LIMIT ?', (chunk,)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    'SELECT user_id FROM users WHERE user_id > ? ORDER BY user_id LIMIT ?',
+                    (last_id, chunk)
+                ).fetchall()
+            if not rows:
+                break
+            for row in rows:
+                yield row[0]
+            last_id = rows[-1][0]
+    
+    def get_recent_users(self, limit=5):
+        """Get most recently joined users"""
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
             cursor.execute('''
-                SELECT user_id, username, first_name, join_date, download_count, last_active
+                SELECT user_id, username, first_name, download_count
                 FROM users ORDER BY join_date DESC
-            ''')
+                LIMIT ?
+            ''', (limit,))
             
             users = cursor.fetchall()
-            conn.close()
             
-            user_list = []
-            for user in users:
-                user_list.append({
-                    'user_id': user[0],
-                    'username': user[1],
-                    'first_name': user[2],
-                    'join_date': user[3],
-                    'download_count': user[4],
-                    'last_active': user[5]
-                })
-            
-            return user_list
+            return [dict(user) for user in users]
         except Exception as e:
-            logger.error(f"Error getting all users: {e}")
+            logger.error(f"Error getting recent users: {e}")
             return []
     
+    def get_users_page(self, offset=0, limit=50):
+        """Get one page of users plus the total user count"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT COUNT(*) FROM users')
+            total = cursor.fetchone()[0]
+            
+            cursor.execute('''
+                SELECT user_id, username, first_name, download_count
+                FROM users ORDER BY join_date DESC
+                LIMIT ? OFFSET ?
+            ''', (limit, offset))
+            
+            users = cursor.fetchall()
+            
+            return [dict(user) for user in users], total
+        except Exception as e:
+            logger.error(f"Error getting users page: {e}")
+            return [], 0
+    
     def get_total_users(self):
         """Get total user count"""
         try:
@@ -197,7 +494,6 @@ class DatabaseManager:
             
             cursor.execute('SELECT COUNT(*) FROM users')
             count = cursor.fetchone()[0]
-            conn.close()
             
             return count
         except Exception as e:
@@ -208,21 +504,35 @@ class DatabaseManager:
     def add_download(self, user_id, file_name, file_size, status='success'):
         """Add download record"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO downloads (user_id, file_name, file_size, status)
-                VALUES (?, ?, ?, ?)
-            ''', (user_id, file_name, file_size, status))
-            
-            conn.commit()
-            conn.close()
+            self._submit_write(
+                (self.SQL_INSERT_DOWNLOAD, (user_id, file_name, file_size, status)),
+                (self.SQL_COUNT_DOWNLOADS, (1, 1)),
+            ).result()
             return True
         except Exception as e:
             logger.error(f"Error adding download: {e}")
             return False
     
+    def record_download(self, user_id, file_name, file_size, status='success', wait=True):
+        """Add a download record and bump the user's activity in one transaction.
+        
+        With wait=False the write is only queued; errors are logged by the writer.
+        """
+        try:
+            future = self._submit_write(
+                (self.SQL_INSERT_DOWNLOAD, (user_id, file_name, file_size, status)),
+                (self.SQL_COUNT_DOWNLOADS, (1, 1)),
+                (self.SQL_UPDATE_ACTIVITY, (user_id,)),
+            )
+            if not wait:
+                future.add_done_callback(self._log_failed_write)
+                return True
+            future.result()
+            return True
+        except Exception as e:
+            logger.error(f"Error recording download: {e}")
+            return False
+    
     def get_recent_downloads(self, limit=10):
         """Get recent downloads"""
         try:
@@ -230,63 +540,96 @@ class DatabaseManager:
             cursor = conn.cursor()
             
             cursor.execute('''
-                SELECT d.file_name, d.file_size, d.download_date, u.first_name, u.username
+                SELECT d.file_name, d.file_size, d.download_date, u.first_name AS user_name, u.username
                 FROM downloads d
                 JOIN users u ON d.user_id = u.user_id
-                ORDER BY d.download_date DESC
+                ORDER BY d.id DESC
                 LIMIT ?
             ''', (limit,))
             
             downloads = cursor.fetchall()
-            conn.close()
             
-            download_list = []
-            for download in downloads:
-                download_list.append({
-                    'file_name': download[0],
-                    'file_size': download[1],
-                    'download_date': download[2],
-                    'user_name': download[3],
-                    'username': download[4]
-                })
-            
-            return download_list
+            return [dict(download) for download in downloads]
         except Exception as e:
             logger.error(f"Error getting recent downloads: {e}")
             return []
     
     # Admin settings methods
+    def _cached_setting(self, key):
+        """Cached value for key (possibly _MISSING), or None if absent or stale"""
+        entry = self._settings_cache.get(key)
+        if entry is not None and time.monotonic() - entry[1] <= SETTINGS_TTL:
+            return entry[0]
+        return None
+    
+    def _cache_setting(self, key, value, generation):
+        """Remember a value read from the DB, unless the setting was written since"""
+        with self._settings_lock:
+            # A write that committed after our SELECT bumped the generation;
+            # caching the older value would hide it for SETTINGS_TTL
+            if self._settings_generation.get(key, 0) == generation:
+                self._settings_cache[key] = (value, time.monotonic())
+    
     def get_setting(self, key, default=None):
         """Get admin setting"""
+        value = self._cached_setting(key)
+        if value is not None:
+            return default if value is _MISSING else value
+        
         try:
+            generation = self._settings_generation.get(key, 0)
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT setting_value FROM admin_settings WHERE setting_key = ?
-            ''', (key,))
+            cursor.execute(self.SQL_GET_SETTING, (key,))
             
             result = cursor.fetchone()
-            conn.close()
             
+            self._cache_setting(key, result[0] if result else _MISSING, generation)
             return result[0] if result else default
         except Exception as e:
             logger.error(f"Error getting setting: {e}")
             return default
     
-    def update_setting(self, key, value):
-        """Update admin setting"""
+    def get_settings(self, keys):
+        """Get several admin settings in one query"""
+        cached = {key: self._cached_setting(key) for key in keys}
+        if None not in cached.values():
+            return {key: value for key, value in cached.items() if value is not _MISSING}
+        
         try:
+            generations = {key: self._settings_generation.get(key, 0) for key in keys}
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            cursor.execute('''
-                INSERT OR REPLACE INTO admin_settings (setting_key, setting_value)
+            # Same key count -> same SQL text, so sqlite3's statement cache is reused
+            placeholders = ','.join('?' * len(keys))
+            cursor.execute(f'''
+                SELECT setting_key, setting_value FROM admin_settings
+                WHERE setting_key IN ({placeholders})
+            ''', tuple(keys))
+            
+            settings = dict(cursor.fetchall())
+            for key in keys:
+                self._cache_setting(key, settings.get(key, _MISSING), generations[key])
+            return settings
+        except Exception as e:
+            logger.error(f"Error getting settings: {e}")
+            return {}
+    
+    def update_setting(self, key, value):
+        """Update admin setting"""
+        try:
+            self._submit_write(('''
+                INSERT INTO admin_settings (setting_key, setting_value)
                 VALUES (?, ?)
-            ''', (key, value))
-            
-            conn.commit()
-            conn.close()
+                ON CONFLICT(setting_key) DO UPDATE SET
+                    setting_value = excluded.setting_value,
+                    updated_at = CURRENT_TIMESTAMP
+            ''', (key, value))).result()
+            with self._settings_lock:
+                self._settings_generation[key] = self._settings_generation.get(key, 0) + 1
+                self._settings_cache[key] = (value, time.monotonic())
             return True
         except Exception as e:
             logger.error(f"Error updating setting: {e}")
@@ -296,17 +639,14 @@ class DatabaseManager:
     def add_force_subscribe_channel(self, channel_id, channel_name, channel_link):
         """Add force subscribe channel"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO force_subscribe 
-                (channel_id, channel_name, channel_link)
+            self._submit_write(('''
+                INSERT INTO force_subscribe (channel_id, channel_name, channel_link)
                 VALUES (?, ?, ?)
-            ''', (channel_id, channel_name, channel_link))
-            
-            conn.commit()
-            conn.close()
+                ON CONFLICT(channel_id) DO UPDATE SET
+                    channel_name = excluded.channel_name,
+                    channel_link = excluded.channel_link
+            ''', (channel_id, channel_name, channel_link))).result()
+            self._invalidate_channels()
             return True
         except Exception as e:
             logger.error(f"Error adding force subscribe channel: {e}")
@@ -315,44 +655,47 @@ class DatabaseManager:
     def remove_force_subscribe_channel(self, channel_id):
         """Remove force subscribe channel"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            # False when no such channel, e.g. a second tap on a stale menu
+            removed = self._submit_write(('''
                 DELETE FROM force_subscribe WHERE channel_id = ?
-            ''', (channel_id,))
-            
-            conn.commit()
-            conn.close()
-            return True
+            ''', (channel_id,))).result() > 0
+            self._invalidate_channels()
+            return removed
         except Exception as e:
             logger.error(f"Error removing force subscribe channel: {e}")
             return False
     
+    def _invalidate_channels(self):
+        """Drop the cached channel list after a change, and any read racing it"""
+        with self._channels_lock:
+            self._channels_generation += 1
+            self._channels_cache = None
+    
     def get_force_subscribe_channels(self):
         """Get all force subscribe channels"""
+        # Checked on every user message, but changed only from the admin panel
+        cached = self._channels_cache
+        if cached is not None and time.monotonic() - cached[1] <= CHANNELS_TTL:
+            return cached[0]
+        
         try:
+            generation = self._channels_generation
             conn = self.get_connection()
             cursor = conn.cursor()
             
             cursor.execute('''
                 SELECT channel_id, channel_name, channel_link 
                 FROM force_subscribe 
-                ORDER BY added_date DESC
+                ORDER BY id DESC
             ''')
             
-            channels = cursor.fetchall()
-            conn.close()
-            
-            channel_list = []
-            for channel in channels:
-                channel_list.append({
-                    'channel_id': channel[0],
-                    'channel_name': channel[1],
-                    'channel_link': channel[2]
-                })
+            channels = [dict(channel) for channel in cursor.fetchall()]
             
-            return channel_list
+            with self._channels_lock:
+                # Not cached if a channel was added/removed after our SELECT
+                if self._channels_generation == generation:
+                    self._channels_cache = (channels, time.monotonic())
+            return channels
         except Exception as e:
             logger.error(f"Error getting force subscribe channels: {e}")
             return []
@@ -363,29 +706,18 @@ class DatabaseManager:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            # Total users
-            cursor.execute('SELECT COUNT(*) FROM users')
-            total_users = cursor.fetchone()[0]
-            
-            # Today's active users
-            cursor.execute('''
-                SELECT COUNT(*) FROM users 
-                WHERE DATE(last_active) = DATE('now')
-            ''')
-            today_active = cursor.fetchone()[0]
-            
-            # Total downloads
-            cursor.execute('SELECT COUNT(*) FROM downloads')
-            total_downloads = cursor.fetchone()[0]
-            
-            # Today's downloads
+            # All four counts in one statement; the range predicate keeps
+            # last_active index-friendly and downloads come from counters
             cursor.execute('''
-                SELECT COUNT(*) FROM downloads 
-                WHERE DATE(download_date) = DATE('now')
+                SELECT
+                    (SELECT COUNT(*) FROM users),
+                    (SELECT COUNT(*) FROM users
+                     WHERE last_active >= DATE('now') AND last_active < DATE('now', '+1 day')),
+                    COALESCE((SELECT value FROM counters WHERE name = 'total_downloads'), 0),
+                    COALESCE((SELECT value FROM counters WHERE name = 'downloads:' || DATE('now')), 0)
             ''')
-            today_downloads = cursor.fetchone()[0]
+            total_users, today_active, total_downloads, today_downloads = cursor.fetchone()
             
-            conn.close()
             
             return {
                 'total_users': total_users,
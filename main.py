@@ -9,13 +9,29 @@ from urllib.parse import urlparse
 from telebot.types import InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup
 from telebot import types
 import re
+import math
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson parses upstream API responses faster; stdlib json also takes bytes
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
 
 # Import database and admin modules
 from database import DatabaseManager
+from admin import (
+    BOT_WORKER_THREADS as ADMIN_BOT_WORKER_THREADS,
+    BROADCAST_WORKERS,
+    MAX_CHAT_WORKERS,
+)
 
-# Configure logging
+# Configure logging (LOG_LEVEL=DEBUG shows per-link API tracing)
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv('LOG_LEVEL', 'INFO').upper(),
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
@@ -27,18 +43,68 @@ ADMIN_IDS = os.getenv('ADMIN_IDS', '').split(',')
 if not BOT_TOKEN:
     raise ValueError("❌ BOT_TOKEN environment variable not set!")
 
+# Handlers run on this many worker threads, so one slow link lookup
+# doesn't hold up everyone else's updates
+BOT_WORKER_THREADS = 16
+
+# Threads that can be calling Telegram at once: bot handlers, a separate
+# admin bot's handlers, admin chat workers, broadcast senders, plus a few
+# for the polling loops and debounced admin edits. A smaller pool makes
+# urllib3 throw away the extra connections and reconnect under load
+TELEGRAM_POOL_SIZE = (
+    BOT_WORKER_THREADS + ADMIN_BOT_WORKER_THREADS
+    + MAX_CHAT_WORKERS + BROADCAST_WORKERS + 8
+)
+
+# One keep-alive connection pool for every Telegram API call in this process
+# (telebot otherwise creates a session per thread and recycles it every 10 min)
+telegram_session = requests.Session()
+telegram_session.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=TELEGRAM_POOL_SIZE,
+    max_retries=Retry(total=3, backoff_factor=0.2)
+))
+telebot.apihelper.session = telegram_session
+telebot.apihelper.SESSION_TIME_TO_LIVE = None
+
+# Most requests in flight to any one upstream API host at a time. Each API
+# gets its own pool of this size, so calls queued for a slow host never
+# take threads away from the others
+API_HOST_CONCURRENCY = 4
+# A dead upstream fails on connect within seconds; a live one gets time to answer
+API_CONNECT_TIMEOUT = 5
+API_READ_TIMEOUT = 20
+
+# Resolved links are reused for LINK_CACHE_TTL seconds (download URLs expire)
+LINK_CACHE_TTL = 600
+LINK_CACHE_SIZE = 2048
+# Longest one link lookup runs before giving up on the APIs still pending
+LOOKUP_TIMEOUT = 60
+# Longest a request waits on another thread's lookup of the same link; the
+# owner is bounded by LOOKUP_TIMEOUT, so this only guards against a stuck owner
+INFLIGHT_TIMEOUT = LOOKUP_TIMEOUT + 10
+
 # Initialize bot and database
-bot = telebot.TeleBot(BOT_TOKEN, parse_mode='HTML')
+bot = telebot.TeleBot(BOT_TOKEN, parse_mode='HTML', threaded=True, num_threads=BOT_WORKER_THREADS)
 db = DatabaseManager()
 
 class TeraboxDownloader:
     def __init__(self):
         self.apis = [
             self.api_terabox_dl,
-            self.api_tb_botbns,
-            self.api_terabox_online,
-            self.api_terabox_api
+            self.api_tb_botbns
         ]
+        # Each API is a different host, so one thread pool per API caps per-host load
+        self._api_executors = {
+            api: ThreadPoolExecutor(max_workers=API_HOST_CONCURRENCY, thread_name_prefix=f'terabox-api{i}')
+            for i, api in enumerate(self.apis, 1)
+        }
+        self._link_cache = OrderedDict()
+        self._link_cache_lock = threading.Lock()
+        # Link key -> Future of a lookup in progress, so concurrent requests
+        # for the same link share one set of upstream calls
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -46,20 +112,34 @@ class TeraboxDownloader:
             'Accept-Language': 'en-US,en;q=0.9',
             'Referer': 'https://www.terabox.com/'
         })
+        # Keep-alive pool big enough for every concurrent API call, with
+        # retries for transient gateway errors
+        adapter = HTTPAdapter(
+            pool_connections=len(self.apis),
+            pool_maxsize=API_HOST_CONCURRENCY,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.3,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=['GET', 'POST']
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
 
     def api_terabox_dl(self, link):
         """API 1: terabox-dl.com"""
         try:
             url = "https://terabox-dl.com/api/get-info"
             payload = {'url': link}
-            response = self.session.post(url, data=payload, timeout=45)
+            response = self.session.post(url, data=payload, timeout=(API_CONNECT_TIMEOUT, API_READ_TIMEOUT))
             if response.status_code == 200:
-                data = response.json()
-                logger.info(f"API1 Success: {data.get('filename', 'Unknown')}")
+                data = json_loads(response.content)
+                logger.debug("API1 Success: %s", data.get('filename', 'Unknown'))
                 return self.format_response(data)
             return None
         except Exception as e:
-            logger.error(f"API1 Error: {e}")
+            logger.error("API1 Error: %s", e)
             return None
 
     def api_tb_botbns(self, link):
@@ -67,16 +147,16 @@ class TeraboxDownloader:
         try:
             url = "https://tb.botbns.xyz/api/getInfo"
             payload = {'url': link}
-            response = self.session.post(url, json=payload, timeout=45)
+            response = self.session.post(url, json=payload, timeout=(API_CONNECT_TIMEOUT, API_READ_TIMEOUT))
             if response.status_code == 200:
-                data = response.json()
+                data = json_loads(response.content)
                 if data.get('success'):
                     file_data = data.get('data', {})
-                    logger.info(f"API2 Success: {file_data.get('filename', 'Unknown')}")
+                    logger.debug("API2 Success: %s", file_data.get('filename', 'Unknown'))
                     return self.format_response(file_data)
             return None
         except Exception as e:
-            logger.error(f"API2 Error: {e}")
+            logger.error("API2 Error: %s", e)
             return None
 
     def format_response(self, data):
@@ -102,58 +182,298 @@ class TeraboxDownloader:
 
         return result
 
+    @staticmethod
+    def cache_key(link):
+        """Normalize a link so trivially different spellings share a cache entry"""
+        parsed = urlparse(link.strip())
+        host = parsed.netloc.lower()
+        if host.startswith('www.'):
+            host = host[4:]
+        # The query is kept: /sharing/link?surl=... identifies the file by it
+        return f"{host}{parsed.path.rstrip('/')}?{parsed.query}"
+    
+    def cached_info(self, key):
+        """Cached download info for a cache key, or None if missing or expired"""
+        with self._link_cache_lock:
+            entry = self._link_cache.get(key)
+            if entry is not None and time.monotonic() - entry[1] <= LINK_CACHE_TTL:
+                self._link_cache.move_to_end(key)
+                return entry[0]
+        return None
+    
     def get_download_info(self, link):
-        """Try all APIs with proper error handling"""
-        logger.info(f"Processing link: {link}")
+        """Return download info for link, from cache or the upstream APIs"""
+        key = self.cache_key(link)
+        result = self.cached_info(key)
+        if result is not None:
+            return result
+        
+        with self._inflight_lock:
+            # An owner caches its result before leaving _inflight, so checking
+            # again here stops a caller that just missed both from querying again
+            result = self.cached_info(key)
+            if result is not None:
+                return result
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
         
-        for i, api_method in enumerate(self.apis):
+        if not owner:
             try:
-                logger.info(f"Trying API {i+1}...")
-                result = api_method(link)
+                return future.result(timeout=INFLIGHT_TIMEOUT)
+            except FutureTimeout:
+                logger.error("Timed out waiting for in-flight lookup: %s", link)
+                return None
+        
+        try:
+            result = self.query_apis(link)
+            if result:
+                with self._link_cache_lock:
+                    self._link_cache[key] = (result, time.monotonic())
+                    self._link_cache.move_to_end(key)
+                    if len(self._link_cache) > LINK_CACHE_SIZE:
+                        self._link_cache.popitem(last=False)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+    
+    def query_apis(self, link):
+        """Query all APIs at once and return the first usable result"""
+        logger.debug("Processing link: %s", link)
+        
+        futures = {
+            self._api_executors[api_method].submit(api_method, link): i
+            for i, api_method in enumerate(self.apis)
+        }
+        try:
+            for future in as_completed(futures, timeout=LOOKUP_TIMEOUT):
+                i = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error("API %d failed: %s", i + 1, e)
+                    continue
                 if result and (result.get('download_url') or result.get('qualities')):
-                    logger.info(f"API {i+1} successful!")
+                    logger.debug("API %d successful!", i + 1)
                     return result
-                time.sleep(1)  # Avoid rate limiting
-            except Exception as e:
-                logger.error(f"API {i+1} failed: {e}")
-                continue
+        except FutureTimeout:
+            logger.error("No API answered within %ds: %s", LOOKUP_TIMEOUT, link)
+        finally:
+            # Calls that haven't started yet are no longer needed
+            for future in futures:
+                future.cancel()
         
         return None
 
 # Initialize downloader
 downloader = TeraboxDownloader()
 
+# Hosts whose share links the downloader APIs understand
+TERABOX_HOSTS = frozenset({
+    'terabox.com', 'www.terabox.com',
+    '1024terabox.com', 'www.1024terabox.com',
+    'teraboxapp.com', 'www.teraboxapp.com',
+})
+
+# Compiled once at import instead of on every call
+SIZE_STRIP_RE = re.compile(r'[^\d.]')
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+def extract_terabox_link(text):
+    """Return the first Terabox link in text, or None"""
+    for word in text.split():
+        if not word.startswith(('http://', 'https://')):
+            continue
+        try:
+            parsed = urlparse(word)
+        except ValueError:
+            # e.g. "http://[x" (malformed IPv6 host) - not a link we can use
+            continue
+        if parsed.netloc.lower() in TERABOX_HOSTS and len(parsed.path) > 1:
+            return word
+    return None
+
 def is_terabox_link(text):
     """Check if text is a valid Terabox link"""
-    patterns = [
-        r'https?://(www\.)?terabox\.com/[^\s]+',
-        r'https?://(www\.)?1024terabox\.com/[^\s]+',
-        r'https?://(www\.)?teraboxapp\.com/[^\s]+'
-    ]
-    
-    for pattern in patterns:
-        if re.search(pattern, text):
-            return True
-    return False
+    return extract_terabox_link(text) is not None
 
 def format_file_size(size_str):
     """Format file size for better display"""
     if not size_str or size_str == 'Unknown Size':
         return 'Unknown Size'
     
-    size_str = re.sub(r'[^\d.]', '', size_str)
+    size_str = SIZE_STRIP_RE.sub('', size_str)
     if not size_str:
         return 'Unknown Size'
     
     try:
         size_bytes = float(size_str)
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.2f} PB"
-    except:
+    except ValueError:
         return 'Unknown Size'
+    
+    # Huge digit strings parse as inf, which has no bit length
+    if not math.isfinite(size_bytes):
+        return f"{size_bytes:.2f} {SIZE_UNITS[-1]}"
+    
+    # Unit index straight from the bit length: each unit is 2**10 larger
+    index = min(max(int(size_bytes).bit_length() - 1, 0) // 10, len(SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * index)):.2f} {SIZE_UNITS[index]}"
+
+# Fixed replies, built once at import instead of on every message
+WELCOME_TEXT = """
+<b>🚀 TERABOX DOWNLOADER BOT</b>
+
+<i>मैं किसी भी size की Terabox files को download कर सकता हूँ! (2GB+ तक)</i>
+
+<b>📌 How to Use:</b>
+1. Terabox की किसी भी link को यहाँ paste करें
+2. Bot automatically file information fetch करेगा
+3. Download button पर click करें
+
+<b>✅ Supported Files:</b>
+• Videos (MP4, MKV, AVI, MOV) - 2GB+ तक
+• Audio (MP3, M4A, WAV, FLAC)
+• Documents (PDF, ZIP, RAR, DOC)
+• Images (JPG, PNG, GIF, WEBP)
+
+<b>🔧 Commands:</b>
+/start - Bot start करें
+/help - Help message
+/stats - Your statistics
+
+<b>⚠️ Note:</b>
+• Large files को download करने में time लग सकता है
+• Internet speed के according download time vary करेगा
+"""
+
+HELP_TEXT = """
+<b>📖 HOW TO USE</b>
+
+1. <b>Copy Terabox Link:</b>
+   • Terabox app या website से file की link copy करें
+
+2. <b>Paste Here:</b>
+   • Link को directly यहाँ paste कर दें
+
+3. <b>Wait:</b>
+   • Bot automatically file information fetch करेगा
+
+4. <b>Download:</b>
+   • Download button पर click करें
+
+<b>Example Links:</b>
+<code>https://terabox.com/s/xxxxxxxxxxxx</code>
+<code>https://www.terabox.com/sharing/xxxxxxxx</code>
+"""
+
+SUPPORT_TEXT = """
+<b>🔧 SUPPORT</b>
+
+<b>If facing issues:</b>
+• Valid Terabox link check करें
+• Internet connection check करें
+• कुछ minutes बाद फिर try करें
+• Large files के लिए wait करें
+
+<b>Common Issues:</b>
+• Invalid link - Correct format use करें
+• File not found - Link check करें
+• Server busy - Wait और retry करें
+"""
+
+INVALID_LINK_TEXT = (
+    "❌ <b>Invalid Terabox Link!</b>\n\n"
+    "कृपया एक valid Terabox link भेजें।\n\n"
+    "<b>Example:</b>\n"
+    "<code>https://terabox.com/s/xxxxxxxx</code>\n"
+    "<code>https://www.terabox.com/sharing/xxxxxxxx</code>"
+)
+
+MAINTENANCE_TEXT = (
+    "🔧 <b>Bot Under Maintenance</b>\n\n"
+    "The bot is currently under maintenance. Please try again later."
+)
+
+PROCESSING_TEXT = (
+    "⏳ <b>Processing Your Link...</b>\n\n"
+    "File information fetch की जा रही है।\n"
+    "कृपया wait करें..."
+)
+
+DOWNLOAD_FAILED_TEXT = (
+    "❌ <b>Download Failed!</b>\n\n"
+    "Possible reasons:\n"
+    "• Invalid या expired link\n"
+    "• File removed हो गया है\n"
+    "• Server temporary unavailable\n"
+    "• Link password protected है\n\n"
+    "कृपया:\n"
+    "✅ Link validity check करें\n"
+    "✅ कुछ देर बाद try करें\n"
+    "✅ Different link try करें"
+)
+
+ERROR_TEXT = (
+    "❌ <b>Unexpected Error Occurred!</b>\n\n"
+    "कृपया कुछ देर बाद फिर से try करें।\n"
+    "Technical team को inform किया गया है।"
+)
+
+NEW_LINK_TEXT = (
+    "🔄 <b>Send New Terabox Link</b>\n\n"
+    "अब आप नया Terabox link भेज सकते हैं।"
+)
+
+MAIN_KEYBOARD = ReplyKeyboardMarkup(resize_keyboard=True)
+MAIN_KEYBOARD.add('📋 How to Use', '🔧 Support')
+
+RETRY_BUTTON = InlineKeyboardButton("🔄 TRY ANOTHER LINK", callback_data="new_link")
+JOINED_BUTTON = InlineKeyboardButton("✅ I've Joined", callback_data="check_subscription")
+
+# Force-subscribe keyboards, keyed by the channel's config so an admin
+# edit (new name or link) simply gets a fresh keyboard
+_subscribe_keyboards = {}
+
+def subscribe_keyboard(channel):
+    """Join + "I've Joined" keyboard for channel, built once per channel config"""
+    key = (channel['channel_id'], channel['channel_name'], channel['channel_link'])
+    keyboard = _subscribe_keyboards.get(key)
+    if keyboard is None:
+        keyboard = InlineKeyboardMarkup()
+        keyboard.add(InlineKeyboardButton(f"Join {channel['channel_name']}", url=channel['channel_link']))
+        keyboard.add(JOINED_BUTTON)
+        if len(_subscribe_keyboards) >= 64:
+            _subscribe_keyboards.clear()
+        _subscribe_keyboards[key] = keyboard
+    return keyboard
+
+# Confirmed memberships are trusted for MEMBER_TTL seconds. Only positive
+# results are cached, so "I've Joined" is always re-checked right away
+MEMBER_TTL = 60
+MEMBER_CACHE_SIZE = 10000
+_member_cache = {}
+
+def is_channel_member(channel_id, user_id):
+    """Whether user_id is in channel_id, asking Telegram at most once per MEMBER_TTL"""
+    key = (user_id, channel_id)
+    checked_at = _member_cache.get(key)
+    if checked_at is not None and time.monotonic() - checked_at <= MEMBER_TTL:
+        return True
+    
+    chat_member = bot.get_chat_member(channel_id, user_id)
+    if chat_member.status in ['left', 'kicked']:
+        return False
+    
+    if len(_member_cache) >= MEMBER_CACHE_SIZE:
+        _member_cache.clear()
+    _member_cache[key] = time.monotonic()
+    return True
 
 def check_force_subscribe(user_id):
     """Check if user is subscribed to required channels"""
@@ -164,11 +484,10 @@ def check_force_subscribe(user_id):
     
     for channel in channels:
         try:
-            chat_member = bot.get_chat_member(channel['channel_id'], user_id)
-            if chat_member.status in ['left', 'kicked']:
+            if not is_channel_member(channel['channel_id'], user_id):
                 return False, channel
         except Exception as e:
-            logger.error(f"Error checking channel subscription: {e}")
+            logger.error("Error checking channel subscription: %s", e)
             continue
     
     return True, None
@@ -188,15 +507,7 @@ def send_welcome(message):
     is_subscribed, channel = check_force_subscribe(user_id)
     
     if not is_subscribed:
-        keyboard = InlineKeyboardMarkup()
-        keyboard.add(InlineKeyboardButton(
-            f"Join {channel['channel_name']}", 
-            url=channel['channel_link']
-        ))
-        keyboard.add(InlineKeyboardButton(
-            "✅ I've Joined", 
-            callback_data="check_subscription"
-        ))
+        keyboard = subscribe_keyboard(channel)
         
         bot.send_message(
             message.chat.id,
@@ -210,39 +521,10 @@ def send_welcome(message):
         return
     
     # User is subscribed, show welcome
-    welcome_text = """
-<b>🚀 TERABOX DOWNLOADER BOT</b>
-
-<i>मैं किसी भी size की Terabox files को download कर सकता हूँ! (2GB+ तक)</i>
-
-<b>📌 How to Use:</b>
-1. Terabox की किसी भी link को यहाँ paste करें
-2. Bot automatically file information fetch करेगा
-3. Download button पर click करें
-
-<b>✅ Supported Files:</b>
-• Videos (MP4, MKV, AVI, MOV) - 2GB+ तक
-• Audio (MP3, M4A, WAV, FLAC)
-• Documents (PDF, ZIP, RAR, DOC)
-• Images (JPG, PNG, GIF, WEBP)
-
-<b>🔧 Commands:</b>
-/start - Bot start करें
-/help - Help message
-/stats - Your statistics
-
-<b>⚠️ Note:</b>
-• Large files को download करने में time लग सकता है
-• Internet speed के according download time vary करेगा
-    """
-    
-    keyboard = ReplyKeyboardMarkup(resize_keyboard=True)
-    keyboard.add('📋 How to Use', '🔧 Support')
-    
     bot.send_message(
         message.chat.id,
-        welcome_text,
-        reply_markup=keyboard,
+        WELCOME_TEXT,
+        reply_markup=MAIN_KEYBOARD,
         disable_web_page_preview=True
     )
 
@@ -286,62 +568,28 @@ def show_stats(message):
 def handle_buttons(message):
     """Handle button clicks"""
     if message.text == '📋 How to Use':
-        help_text = """
-<b>📖 HOW TO USE</b>
-
-1. <b>Copy Terabox Link:</b>
-   • Terabox app या website से file की link copy करें
-
-2. <b>Paste Here:</b>
-   • Link को directly यहाँ paste कर दें
-
-3. <b>Wait:</b>
-   • Bot automatically file information fetch करेगा
-
-4. <b>Download:</b>
-   • Download button पर click करें
-
-<b>Example Links:</b>
-<code>https://terabox.com/s/xxxxxxxxxxxx</code>
-<code>https://www.terabox.com/sharing/xxxxxxxx</code>
-        """
-        bot.send_message(message.chat.id, help_text, disable_web_page_preview=True)
+        bot.send_message(message.chat.id, HELP_TEXT, disable_web_page_preview=True)
     
     elif message.text == '🔧 Support':
-        support_text = """
-<b>🔧 SUPPORT</b>
+        bot.send_message(message.chat.id, SUPPORT_TEXT)
 
-<b>If facing issues:</b>
-• Valid Terabox link check करें
-• Internet connection check करें
-• कुछ minutes बाद फिर try करें
-• Large files के लिए wait करें
-
-<b>Common Issues:</b>
-• Invalid link - Correct format use करें
-• File not found - Link check करें
-• Server busy - Wait और retry करें
-        """
-        bot.send_message(message.chat.id, support_text)
-
-@bot.message_handler(func=lambda message: True)
+# Commands are left to their own handlers (e.g. /admin from AdminPanel)
+@bot.message_handler(func=lambda message: not message.text.startswith('/'))
 def handle_all_messages(message):
     """Handle all incoming messages"""
     user_id = message.from_user.id
     text = message.text.strip()
     
-    # Check force subscribe first
+    # Plain chat is rejected before any DB or Telegram API work
+    link = extract_terabox_link(text)
+    if link is None:
+        bot.reply_to(message, INVALID_LINK_TEXT, disable_web_page_preview=True)
+        return
+    
+    # Check force subscribe
     is_subscribed, channel = check_force_subscribe(user_id)
     if not is_subscribed:
-        keyboard = InlineKeyboardMarkup()
-        keyboard.add(InlineKeyboardButton(
-            f"Join {channel['channel_name']}", 
-            url=channel['channel_link']
-        ))
-        keyboard.add(InlineKeyboardButton(
-            "✅ I've Joined", 
-            callback_data="check_subscription"
-        ))
+        keyboard = subscribe_keyboard(channel)
         
         bot.send_message(
             message.chat.id,
@@ -352,51 +600,21 @@ def handle_all_messages(message):
         )
         return
     
-    # Check if it's a Terabox link
-    if not is_terabox_link(text):
-        bot.reply_to(message, 
-            "❌ <b>Invalid Terabox Link!</b>\n\n"
-            "कृपया एक valid Terabox link भेजें।\n\n"
-            "<b>Example:</b>\n"
-            "<code>https://terabox.com/s/xxxxxxxx</code>\n"
-            "<code>https://www.terabox.com/sharing/xxxxxxxx</code>",
-            disable_web_page_preview=True
-        )
-        return
-    
     # Check maintenance mode
     if db.get_setting('maintenance_mode') == 'true':
-        bot.reply_to(message,
-            "🔧 <b>Bot Under Maintenance</b>\n\n"
-            "The bot is currently under maintenance. Please try again later.",
-            disable_web_page_preview=True
-        )
+        bot.reply_to(message, MAINTENANCE_TEXT, disable_web_page_preview=True)
         return
     
     # Send processing message
-    processing_msg = bot.reply_to(message, 
-        "⏳ <b>Processing Your Link...</b>\n\n"
-        "File information fetch की जा रही है।\n"
-        "कृपया wait करें...",
-        disable_web_page_preview=True
-    )
+    processing_msg = bot.reply_to(message, PROCESSING_TEXT, disable_web_page_preview=True)
     
     # Get download information
     try:
-        file_info = downloader.get_download_info(text)
+        file_info = downloader.get_download_info(link)
         
         if not file_info:
             bot.edit_message_text(
-                "❌ <b>Download Failed!</b>\n\n"
-                "Possible reasons:\n"
-                "• Invalid या expired link\n"
-                "• File removed हो गया है\n"
-                "• Server temporary unavailable\n"
-                "• Link password protected है\n\n"
-                "कृपया:\n"
-                "✅ Link validity check करें\n"
-                "✅ कुछ देर बाद try करें\n"
-                "✅ Different link try करें",
+                DOWNLOAD_FAILED_TEXT,
                 chat_id=message.chat.id,
                 message_id=processing_msg.message_id,
                 disable_web_page_preview=True
@@ -422,20 +640,15 @@ def handle_all_messages(message):
                         url=url
                     ))
         
-        # Add retry button
-        keyboard.add(InlineKeyboardButton(
-            "🔄 TRY ANOTHER LINK", 
-            callback_data="new_link"
-        ))
+        keyboard.add(RETRY_BUTTON)
         
         # Format file information
         filename = file_info.get('filename', 'Unknown File')
         size = format_file_size(file_info.get('size'))
         duration = file_info.get('duration', 'N/A')
         
-        # Update user activity and add download record
-        db.update_user_activity(user_id)
-        db.add_download(user_id, filename, size)
+        # Queued for the DB writer thread; the reply doesn't wait for the commit
+        db.record_download(user_id, filename, size, wait=False)
         
         # Prepare success message
         success_text = f"""
@@ -459,11 +672,9 @@ def handle_all_messages(message):
         )
         
     except Exception as e:
-        logger.error(f"Error in handle_all_messages: {e}")
+        logger.error("Error in handle_all_messages: %s", e)
         bot.edit_message_text(
-            "❌ <b>Unexpected Error Occurred!</b>\n\n"
-            "कृपया कुछ देर बाद फिर से try करें।\n"
-            "Technical team को inform किया गया है।",
+            ERROR_TEXT,
             chat_id=message.chat.id,
             message_id=processing_msg.message_id
         )
@@ -474,40 +685,43 @@ def handle_new_link(call):
     bot.delete_message(call.message.chat.id, call.message.message_id)
     bot.send_message(
         call.message.chat.id,
-        "🔄 <b>Send New Terabox Link</b>\n\n"
-        "अब आप नया Terabox link भेज सकते हैं।",
+        NEW_LINK_TEXT,
         disable_web_page_preview=True
     )
 
 def main():
-    """Main function to start the bot"""
+    """Main function to start the bot; returns True once polling stops cleanly"""
     logger.info("Starting Terabox Downloader Bot...")
     
     try:
         # Test bot connection
         bot_info = bot.get_me()
-        logger.info(f"Bot started successfully: @{bot_info.username}")
+        logger.info("Bot started successfully: @%s", bot_info.username)
         
         # Start polling
-        bot.polling(none_stop=True, interval=2, timeout=60)
+        bot.infinity_polling(timeout=60, long_polling_timeout=60, skip_pending=True)
+        return True
         
     except Exception as e:
-        logger.error(f"Bot failed to start: {e}")
-        time.sleep(30)
-        main()  # Restart bot
+        logger.error("Bot failed to start: %s", e)
+        # Drop pooled upstream sockets that may be half-open after an outage;
+        # the loop below restarts us
+        downloader.session.close()
+        return False
 
 if __name__ == "__main__":
     # Create necessary directories
     os.makedirs('logs', exist_ok=True)
     
-    # Start the bot
+    # Start the bot, restarting it in place (no recursion) after failures
     while True:
         try:
-            main()
+            if main():
+                break
         except KeyboardInterrupt:
             logger.info("Bot stopped by user")
             break
         except Exception as e:
-            logger.error(f"Bot crashed: {e}")
-            logger.info("Restarting bot in 10 seconds...")
-            time.sleep(10)
+            logger.error("Bot crashed: %s", e)
+        logger.info("Restarting bot in 10 seconds...")
+        time.sleep(10)